@@ -6,43 +6,64 @@ Contains 10 administrator commands for advanced server management.
 import discord
 from discord.ext import commands
 from discord import app_commands
+from cogs.checks import require_permission
 import asyncio
 from datetime import datetime
 import json
 import logging
 import io
-import zipfile
+
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the stdlib encoder
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Discord rejects custom emoji images larger than 256 KB
+MAX_EMOJI_BYTES = 256 * 1024
+
+def dump_backup_json(data):
+    """Serialize backup data to indented JSON bytes"""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
 class AdministrationCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.log_tasks = set()  # strong refs so pending log sends aren't garbage collected
         
     def create_embed(self, title, description, color=0x3498db, footer=None):
         """Create a styled embed"""
         embed = discord.Embed(title=title, description=description, color=color)
-        embed.timestamp = datetime.utcnow()
+        embed.timestamp = discord.utils.utcnow()
         if footer:
             embed.set_footer(text=footer)
         else:
             embed.set_footer(text="Advanced Administration Bot", icon_url=self.bot.user.avatar.url if self.bot.user.avatar else None)
         return embed
     
+    @staticmethod
+    def snapshot_overwrites(channel):
+        """Copy a channel's explicit permission overwrites keyed by target ID"""
+        return {str(target.id): dict(overwrite._values) for target, overwrite in channel.overwrites.items()}
+    
+    def schedule_log(self, *args, **kwargs):
+        """Send the log entry in the background so the command returns right after responding"""
+        task = asyncio.create_task(self.log_action(*args, **kwargs))
+        self.log_tasks.add(task)
+        task.add_done_callback(self.log_tasks.discard)
+    
     async def log_action(self, guild, action, moderator, target, reason=None):
         """Log administration actions to the log channel"""
         try:
             if not self.bot.db_pool:
                 return
                 
-            async with self.bot.db_pool.acquire() as conn:
-                result = await conn.fetchrow(
-                    "SELECT log_channel_id FROM guild_settings WHERE guild_id = $1",
-                    guild.id
-                )
-                
-            if result and result['log_channel_id']:
-                channel = guild.get_channel(result['log_channel_id'])
+            log_channel_id = await self.bot.get_log_channel_id(guild.id)
+            if log_channel_id:
+                channel = guild.get_channel(log_channel_id)
                 if channel:
                     embed = self.create_embed(
                         f"⚙️ {action}",
@@ -51,17 +72,12 @@ class AdministrationCog(commands.Cog):
                     )
                     await channel.send(embed=embed)
         except Exception as e:
-            logger.error(f"Failed to log action: {e}")
+            logger.error("Failed to log action: %s", e)
     
     @app_commands.command(name="backup_server", description="Create a backup of server settings")
     @app_commands.describe(include_messages="Include recent messages in backup")
+    @require_permission("administrator")
     async def backup_server(self, interaction: discord.Interaction, include_messages: bool = False):
-        if not interaction.user.guild_permissions.administrator:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need administrator permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         await interaction.response.defer()
         
         try:
@@ -89,8 +105,7 @@ class AdministrationCog(commands.Cog):
                     backup_data['categories'].append({
                         'name': channel.name,
                         'position': channel.position,
-                        'overwrites': {str(target.id): {perm: value for perm, value in overwrite._values.items()} 
-                                      for target, overwrite in channel.overwrites.items()}
+                        'overwrites': self.snapshot_overwrites(channel)
                     })
                 elif isinstance(channel, (discord.TextChannel, discord.VoiceChannel)):
                     channel_data = {
@@ -101,8 +116,7 @@ class AdministrationCog(commands.Cog):
                         'topic': getattr(channel, 'topic', None),
                         'slowmode_delay': getattr(channel, 'slowmode_delay', 0),
                         'nsfw': getattr(channel, 'nsfw', False),
-                        'overwrites': {str(target.id): {perm: value for perm, value in overwrite._values.items()} 
-                                      for target, overwrite in channel.overwrites.items()}
+                        'overwrites': self.snapshot_overwrites(channel)
                     }
                     
                     if include_messages and isinstance(channel, discord.TextChannel):
@@ -138,10 +152,10 @@ class AdministrationCog(commands.Cog):
                     'animated': emoji.animated
                 })
             
-            # Create backup file
-            backup_json = json.dumps(backup_data, indent=2)
+            # Create backup file (serialized off the event loop; message history can make this large)
+            backup_json = await asyncio.to_thread(dump_backup_json, backup_data)
             backup_file = discord.File(
-                io.StringIO(backup_json), 
+                io.BytesIO(backup_json), 
                 filename=f"{guild.name}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             )
             
@@ -152,7 +166,7 @@ class AdministrationCog(commands.Cog):
             )
             
             await interaction.followup.send(embed=embed, file=backup_file)
-            await self.log_action(guild, "Server Backup Created", interaction.user, f"Full server backup with {len(backup_data['channels'])} channels")
+            self.schedule_log(guild, "Server Backup Created", interaction.user, f"Full server backup with {len(backup_data['channels'])} channels")
             
         except Exception as e:
             await interaction.followup.send(
@@ -161,13 +175,8 @@ class AdministrationCog(commands.Cog):
     
     @app_commands.command(name="config_bot", description="Configure bot settings for this server")
     @app_commands.describe(log_channel="Channel for logging bot actions", auto_mod="Enable automatic moderation")
+    @require_permission("administrator")
     async def config_bot(self, interaction: discord.Interaction, log_channel: discord.TextChannel = None, auto_mod: bool = None):
-        if not interaction.user.guild_permissions.administrator:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need administrator permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             if not self.bot.db_pool:
                 return await interaction.response.send_message(
@@ -208,13 +217,16 @@ class AdministrationCog(commands.Cog):
                         interaction.guild.id, log_channel.id if log_channel else None, auto_mod or False
                     )
             
+            # Drop the cached log channel so the next log_action picks up the new setting
+            self.bot.log_channel_ids.pop(interaction.guild.id, None)
+            
             embed = self.create_embed(
                 "⚙️ Bot Configuration Updated",
                 f"**Log Channel:** {log_channel.mention if log_channel else 'Not set'}\n**Auto Moderation:** {'Enabled' if auto_mod else 'Disabled' if auto_mod is not None else 'Not changed'}",
                 0x3498db
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Bot Configuration Updated", interaction.user, "Settings modified")
+            self.schedule_log(interaction.guild, "Bot Configuration Updated", interaction.user, "Settings modified")
             
         except Exception as e:
             await interaction.response.send_message(
@@ -224,13 +236,8 @@ class AdministrationCog(commands.Cog):
     
     @app_commands.command(name="setup_permissions", description="Setup role permissions for bot commands")
     @app_commands.describe(moderator_role="Role for moderator commands", admin_role="Role for admin commands")
+    @require_permission("administrator")
     async def setup_permissions(self, interaction: discord.Interaction, moderator_role: discord.Role = None, admin_role: discord.Role = None):
-        if not interaction.user.guild_permissions.administrator:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need administrator permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             settings = {}
             if moderator_role:
@@ -251,7 +258,7 @@ class AdministrationCog(commands.Cog):
                 0x9b59b6
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Permissions Setup", interaction.user, "Role permissions configured")
+            self.schedule_log(interaction.guild, "Permissions Setup", interaction.user, "Role permissions configured")
             
         except Exception as e:
             await interaction.response.send_message(
@@ -261,13 +268,8 @@ class AdministrationCog(commands.Cog):
     
     @app_commands.command(name="create_channel", description="Create a new channel")
     @app_commands.describe(name="Channel name", channel_type="Type of channel", category="Category to place channel in")
+    @require_permission("manage_channels")
     async def create_channel(self, interaction: discord.Interaction, name: str, channel_type: str = "text", category: discord.CategoryChannel = None):
-        if not interaction.user.guild_permissions.manage_channels:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need manage channels permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             if channel_type.lower() == "voice":
                 channel = await interaction.guild.create_voice_channel(name, category=category)
@@ -280,7 +282,7 @@ class AdministrationCog(commands.Cog):
                 0x2ecc71
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Channel Created", interaction.user, f"{channel.mention} ({channel.type})")
+            self.schedule_log(interaction.guild, "Channel Created", interaction.user, f"{channel.mention} ({channel.type})")
             
         except Exception as e:
             await interaction.response.send_message(
@@ -290,13 +292,8 @@ class AdministrationCog(commands.Cog):
     
     @app_commands.command(name="delete_channel", description="Delete a channel")
     @app_commands.describe(channel="Channel to delete", reason="Reason for deletion")
+    @require_permission("manage_channels")
     async def delete_channel(self, interaction: discord.Interaction, channel: discord.abc.GuildChannel, reason: str = None):
-        if not interaction.user.guild_permissions.manage_channels:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need manage channels permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             channel_name = channel.name
             await channel.delete(reason=reason)
@@ -307,7 +304,7 @@ class AdministrationCog(commands.Cog):
                 0xe74c3c
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Channel Deleted", interaction.user, f"#{channel_name}", reason)
+            self.schedule_log(interaction.guild, "Channel Deleted", interaction.user, f"#{channel_name}", reason)
             
         except Exception as e:
             await interaction.response.send_message(
@@ -317,13 +314,8 @@ class AdministrationCog(commands.Cog):
     
     @app_commands.command(name="create_role", description="Create a new role")
     @app_commands.describe(name="Role name", color="Role color (hex)", hoist="Display separately", mentionable="Allow mentioning")
+    @require_permission("manage_roles")
     async def create_role(self, interaction: discord.Interaction, name: str, color: str = None, hoist: bool = False, mentionable: bool = False):
-        if not interaction.user.guild_permissions.manage_roles:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need manage roles permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             role_color = discord.Color.default()
             if color:
@@ -345,7 +337,7 @@ class AdministrationCog(commands.Cog):
                 0x2ecc71
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Role Created", interaction.user, role.mention)
+            self.schedule_log(interaction.guild, "Role Created", interaction.user, role.mention)
             
         except Exception as e:
             await interaction.response.send_message(
@@ -355,13 +347,8 @@ class AdministrationCog(commands.Cog):
     
     @app_commands.command(name="delete_role", description="Delete a role")
     @app_commands.describe(role="Role to delete", reason="Reason for deletion")
+    @require_permission("manage_roles")
     async def delete_role(self, interaction: discord.Interaction, role: discord.Role, reason: str = None):
-        if not interaction.user.guild_permissions.manage_roles:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need manage roles permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             role_name = role.name
             await role.delete(reason=reason)
@@ -372,7 +359,7 @@ class AdministrationCog(commands.Cog):
                 0xe74c3c
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Role Deleted", interaction.user, role_name, reason)
+            self.schedule_log(interaction.guild, "Role Deleted", interaction.user, role_name, reason)
             
         except Exception as e:
             await interaction.response.send_message(
@@ -382,13 +369,8 @@ class AdministrationCog(commands.Cog):
     
     @app_commands.command(name="manage_emoji", description="Add or remove custom emojis")
     @app_commands.describe(action="Add or remove emoji", name="Emoji name", image="Image URL for adding emoji")
+    @require_permission("manage_emojis")
     async def manage_emoji(self, interaction: discord.Interaction, action: str, name: str, image: str = None):
-        if not interaction.user.guild_permissions.manage_emojis:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need manage emojis permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             if action.lower() == "add":
                 if not image:
@@ -399,8 +381,15 @@ class AdministrationCog(commands.Cog):
                 
                 async with self.bot.session.get(image) as resp:
                     if resp.status == 200:
-                        emoji_data = await resp.read()
-                        emoji = await interaction.guild.create_custom_emoji(name=name, image=emoji_data)
+                        # Stream the image and stop as soon as it exceeds Discord's emoji size limit
+                        if resp.content_length and resp.content_length > MAX_EMOJI_BYTES:
+                            raise Exception("Image is larger than 256 KB")
+                        emoji_data = bytearray()
+                        async for chunk in resp.content.iter_chunked(64 * 1024):
+                            emoji_data.extend(chunk)
+                            if len(emoji_data) > MAX_EMOJI_BYTES:
+                                raise Exception("Image is larger than 256 KB")
+                        emoji = await interaction.guild.create_custom_emoji(name=name, image=bytes(emoji_data))
                         
                         embed = self.create_embed(
                             "😀 Emoji Added",
@@ -423,7 +412,7 @@ class AdministrationCog(commands.Cog):
                     raise Exception("Emoji not found")
             
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, f"Emoji {action.title()}ed", interaction.user, name)
+            self.schedule_log(interaction.guild, f"Emoji {action.title()}ed", interaction.user, name)
             
         except Exception as e:
             await interaction.response.send_message(
@@ -433,13 +422,8 @@ class AdministrationCog(commands.Cog):
     
     @app_commands.command(name="audit_logs", description="View recent audit log entries")
     @app_commands.describe(limit="Number of entries to show (1-25)", action="Filter by action type")
+    @require_permission("view_audit_log")
     async def audit_logs(self, interaction: discord.Interaction, limit: int = 10, action: str = None):
-        if not interaction.user.guild_permissions.view_audit_log:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need view audit log permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         await interaction.response.defer()
         
         try:
@@ -470,13 +454,8 @@ class AdministrationCog(commands.Cog):
     
     @app_commands.command(name="mass_action", description="Perform mass actions on members")
     @app_commands.describe(action="Action to perform", role="Target role for action", reason="Reason for action")
+    @require_permission("administrator")
     async def mass_action(self, interaction: discord.Interaction, action: str, role: discord.Role, reason: str = None):
-        if not interaction.user.guild_permissions.administrator:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need administrator permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         await interaction.response.defer()
         
         try:
@@ -489,29 +468,24 @@ class AdministrationCog(commands.Cog):
             success_count = 0
             failed_count = 0
             
-            if action.lower() == "kick":
-                for member in members:
-                    try:
-                        await member.kick(reason=reason)
-                        success_count += 1
-                    except:
-                        failed_count += 1
-            
-            elif action.lower() == "ban":
-                for member in members:
-                    try:
-                        await member.ban(reason=reason)
-                        success_count += 1
-                    except:
-                        failed_count += 1
-            
-            elif action.lower() == "remove_role":
-                for member in members:
-                    try:
-                        await member.remove_roles(role, reason=reason)
-                        success_count += 1
-                    except:
-                        failed_count += 1
+            action_name = action.lower()
+            if action_name == "kick":
+                requests = [member.kick(reason=reason) for member in members]
+            elif action_name == "ban":
+                requests = [member.ban(reason=reason) for member in members]
+            elif action_name == "remove_role":
+                requests = [member.remove_roles(role, reason=reason) for member in members]
+            else:
+                requests = []
+            
+            # Issue all requests concurrently; discord.py's rate limiter is the only serialization point
+            results = await asyncio.gather(*requests, return_exceptions=True)
+            for member, result in zip(members, results):
+                if isinstance(result, Exception):
+                    logger.warning("Mass action: failed to %s %s: %s", action_name, member, result)
+                    failed_count += 1
+                else:
+                    success_count += 1
             
             embed = self.create_embed(
                 f"⚡ Mass {action.title()} Complete",
@@ -519,7 +493,7 @@ class AdministrationCog(commands.Cog):
                 0x9b59b6
             )
             await interaction.followup.send(embed=embed)
-            await self.log_action(interaction.guild, f"Mass {action.title()}", interaction.user, f"{role.mention} ({success_count} members)", reason)
+            self.schedule_log(interaction.guild, f"Mass {action.title()}", interaction.user, f"{role.mention} ({success_count} members)", reason)
             
         except Exception as e:
             await interaction.followup.send(
@@ -0,0 +1,23 @@
+"""
+Shared Checks
+Permission checks used by the slash commands of several cogs.
+"""
+
+import discord
+import functools
+
+def require_permission(permission, label=None):
+    """Reject the interaction unless the invoker has the given guild permission"""
+    # Built once per command at decoration time instead of on every invocation
+    message = f"You need {label or permission.replace('_', ' ')} permission."
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, interaction: discord.Interaction, *args, **kwargs):
+            if not getattr(interaction.user.guild_permissions, permission):
+                return await interaction.response.send_message(
+                    embed=self.create_embed("❌ Permission Denied", message, 0xff0000),
+                    ephemeral=True
+                )
+            return await func(self, interaction, *args, **kwargs)
+        return wrapper
+    return decorator
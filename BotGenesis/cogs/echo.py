@@ -11,9 +11,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Discord rejects the whole message if an embed image URL uses any other scheme
+URL_SCHEMES = ('http://', 'https://')
+
 class EchoCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.help_embed = self.build_help_embed()  # static content, built once
         
     def create_embed(self, title, description, color=0x3498db, footer=None):
         """Create a styled embed"""
@@ -46,7 +50,19 @@ class EchoCog(commands.Cog):
                 ephemeral=True
             )
         
-        # Defer the response to prevent timeout and ensure proper handling
+        # Validate the reply ID before deferring so malformed input is rejected in one response.
+        # Message IDs are snowflakes of at most 20 digits; reject anything else without an int() round-trip
+        if reply_to_id:
+            reply_to_id = reply_to_id.strip()
+            if not reply_to_id.isdecimal() or len(reply_to_id) > 20:
+                return await interaction.response.send_message(
+                    embed=self.create_embed("❌ Error", "Please provide a valid numeric message ID to reply to.", 0xff0000),
+                    ephemeral=True
+                )
+        
+        # Defer the response to prevent timeout and ensure proper handling.
+        # defer() is an extra REST round-trip; only worth it here because the
+        # reply lookup and channel send may not finish within the 3s window.
         await interaction.response.defer(ephemeral=True)
         
         # Set target channel
@@ -57,9 +73,8 @@ class EchoCog(commands.Cog):
             reference = None
             if reply_to_id:
                 try:
-                    reply_message = await target_channel.fetch_message(int(reply_to_id))
-                    reference = reply_message
-                except (discord.NotFound, ValueError):
+                    reference = await target_channel.fetch_message(int(reply_to_id))
+                except (discord.NotFound, discord.Forbidden):
                     return await interaction.followup.send(
                         embed=self.create_embed("❌ Error", "Could not find message with that ID to reply to.", 0xff0000),
                         ephemeral=True
@@ -79,6 +94,13 @@ class EchoCog(commands.Cog):
                             embed.description = embed_data['description']
                         if 'color' in embed_data:
                             embed.color = int(embed_data['color'], 16) if isinstance(embed_data['color'], str) else embed_data['color']
+                        # Discord only accepts http(s) image URLs; name the bad field instead of failing the send
+                        for key in ('thumbnail', 'image'):
+                            if key in embed_data and not str(embed_data[key]).startswith(URL_SCHEMES):
+                                return await interaction.followup.send(
+                                    embed=self.create_embed("❌ Error", f"The `{key}` field must be an http:// or https:// URL.", 0xff0000),
+                                    ephemeral=True
+                                )
                         if 'thumbnail' in embed_data:
                             embed.set_thumbnail(url=embed_data['thumbnail'])
                         if 'image' in embed_data:
@@ -125,14 +147,9 @@ class EchoCog(commands.Cog):
             # Log the action (only to log channel, not the target channel)
             try:
                 if self.bot.db_pool:
-                    async with self.bot.db_pool.acquire() as conn:
-                        result = await conn.fetchrow(
-                            "SELECT log_channel_id FROM guild_settings WHERE guild_id = $1",
-                            interaction.guild.id
-                        )
-                        
-                    if result and result['log_channel_id']:
-                        log_channel = interaction.guild.get_channel(result['log_channel_id'])
+                    log_channel_id = await self.bot.get_log_channel_id(interaction.guild.id)
+                    if log_channel_id:
+                        log_channel = interaction.guild.get_channel(log_channel_id)
                         if log_channel and log_channel != target_channel:
                             log_embed = self.create_embed(
                                 "📢 Echo Command Used",
@@ -145,7 +162,7 @@ class EchoCog(commands.Cog):
                             )
                             await log_channel.send(embed=log_embed)
             except Exception as e:
-                logger.error(f"Failed to log echo action: {e}")
+                logger.error("Failed to log echo action: %s", e)
                 
         except discord.Forbidden:
             await interaction.followup.send(
@@ -158,14 +175,9 @@ class EchoCog(commands.Cog):
                 ephemeral=True
             )
     
-    @app_commands.command(name="echo_help", description="Get help for using the echo command")
-    async def echo_help(self, interaction: discord.Interaction):
-        if not interaction.user.guild_permissions.administrator:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Access Denied", "This command is restricted to administrators only.", 0xff0000),
-                ephemeral=True
-            )
-        
+    @staticmethod
+    def build_help_embed():
+        """Build the static /echo_help embed"""
         help_embed = discord.Embed(
             title="📢 Echo Command Help",
             color=0x3498db
@@ -231,8 +243,17 @@ class EchoCog(commands.Cog):
         )
         
         help_embed.set_footer(text="Echo System - Administrator Only")
+        return help_embed
+    
+    @app_commands.command(name="echo_help", description="Get help for using the echo command")
+    async def echo_help(self, interaction: discord.Interaction):
+        if not interaction.user.guild_permissions.administrator:
+            return await interaction.response.send_message(
+                embed=self.create_embed("❌ Access Denied", "This command is restricted to administrators only.", 0xff0000),
+                ephemeral=True
+            )
         
-        await interaction.response.send_message(embed=help_embed, ephemeral=True)
+        await interaction.response.send_message(embed=self.help_embed, ephemeral=True)
 
 async def setup(bot):
     await bot.add_cog(EchoCog(bot))
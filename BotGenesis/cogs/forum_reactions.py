@@ -36,7 +36,7 @@ class ForumReactionsCog(commands.Cog):
                 thread.parent.id == self.FORUM_CHANNEL_ID and
                 isinstance(thread.parent, discord.ForumChannel)):
                 
-                logger.info(f"New forum thread detected: {thread.name} in {thread.parent.name}")
+                logger.info("New forum thread detected: %s in %s", thread.name, thread.parent.name)
                 
                 # Get the initial message (forum post)
                 try:
@@ -53,24 +53,24 @@ class ForumReactionsCog(commands.Cog):
                         # Add upvote reaction
                         try:
                             await starter_message.add_reaction(self.UPVOTE_EMOJI)
-                            logger.info(f"Added upvote reaction to forum post: {thread.name}")
+                            logger.info("Added upvote reaction to forum post: %s", thread.name)
                         except Exception as e:
-                            logger.error(f"Failed to add upvote reaction: {e}")
+                            logger.error("Failed to add upvote reaction: %s", e)
                         
                         # Add downvote reaction
                         try:
                             await starter_message.add_reaction(self.DOWNVOTE_EMOJI)
-                            logger.info(f"Added downvote reaction to forum post: {thread.name}")
+                            logger.info("Added downvote reaction to forum post: %s", thread.name)
                         except Exception as e:
-                            logger.error(f"Failed to add downvote reaction: {e}")
+                            logger.error("Failed to add downvote reaction: %s", e)
                     else:
-                        logger.warning(f"Could not find starter message for forum thread: {thread.name}")
+                        logger.warning("Could not find starter message for forum thread: %s", thread.name)
                         
                 except Exception as e:
-                    logger.error(f"Error processing forum thread {thread.name}: {e}")
+                    logger.error("Error processing forum thread %s: %s", thread.name, e)
                     
         except Exception as e:
-            logger.error(f"Error in on_thread_create listener: {e}")
+            logger.error("Error in on_thread_create listener: %s", e)
     
     @app_commands.command(name="forum_reactions_info", description="Get information about the forum reactions system")
     async def forum_reactions_info(self, interaction: discord.Interaction):
@@ -149,7 +149,7 @@ class ForumReactionsCog(commands.Cog):
                         '{"forum_reactions_enabled": ' + str(enabled).lower() + '}'
                     )
         except Exception as e:
-            logger.error(f"Failed to save forum reactions setting: {e}")
+            logger.error("Failed to save forum reactions setting: %s", e)
         
         status = "enabled" if enabled else "disabled"
         color = 0x2ecc71 if enabled else 0xe74c3c
@@ -163,7 +163,7 @@ class ForumReactionsCog(commands.Cog):
         await interaction.response.send_message(embed=embed)
         guild_name = interaction.guild.name if interaction.guild else "Unknown Guild"
         user_name = interaction.user.display_name if hasattr(interaction.user, 'display_name') else str(interaction.user)
-        logger.info(f"Forum reactions {status} by {user_name} in {guild_name}")
+        logger.info("Forum reactions %s by %s in %s", status, user_name, guild_name)
     
     async def is_enabled(self, guild_id):
         """Check if forum reactions are enabled for a guild"""
@@ -179,7 +179,7 @@ class ForumReactionsCog(commands.Cog):
                         return settings.get('forum_reactions_enabled', True)  # Default to enabled
             return True  # Default to enabled if no database
         except Exception as e:
-            logger.error(f"Error checking forum reactions status: {e}")
+            logger.error("Error checking forum reactions status: %s", e)
             return True  # Default to enabled on error
 
 async def setup(bot):
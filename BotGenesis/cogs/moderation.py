@@ -6,41 +6,47 @@ Contains 20 moderation commands for server management and user discipline.
 import discord
 from discord.ext import commands
 from discord import app_commands
+from cogs.checks import require_permission
 import asyncio
-from datetime import datetime, timedelta
-import json
+from datetime import timedelta
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Discord snowflake inside a raw ID or a <@mention>
+USER_ID_RE = re.compile(r'\d{15,22}')
+
 class ModerationCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.log_tasks = set()  # strong refs so pending log sends aren't garbage collected
         
     def create_embed(self, title, description, color=0x3498db, footer=None):
         """Create a styled embed"""
         embed = discord.Embed(title=title, description=description, color=color)
-        embed.timestamp = datetime.utcnow()
+        embed.timestamp = discord.utils.utcnow()
         if footer:
             embed.set_footer(text=footer)
         else:
             embed.set_footer(text="Advanced Moderation Bot", icon_url=self.bot.user.avatar.url if self.bot.user.avatar else None)
         return embed
     
+    def schedule_log(self, *args, **kwargs):
+        """Send the log entry in the background so the command returns right after responding"""
+        task = asyncio.create_task(self.log_action(*args, **kwargs))
+        self.log_tasks.add(task)
+        task.add_done_callback(self.log_tasks.discard)
+    
     async def log_action(self, guild, action, moderator, target, reason=None):
         """Log moderation actions to the log channel"""
         try:
             if not self.bot.db_pool:
                 return
                 
-            async with self.bot.db_pool.acquire() as conn:
-                result = await conn.fetchrow(
-                    "SELECT log_channel_id FROM guild_settings WHERE guild_id = $1",
-                    guild.id
-                )
-                
-            if result and result['log_channel_id']:
-                channel = guild.get_channel(result['log_channel_id'])
+            log_channel_id = await self.bot.get_log_channel_id(guild.id)
+            if log_channel_id:
+                channel = guild.get_channel(log_channel_id)
                 if channel:
                     embed = self.create_embed(
                         f"🛡️ {action}",
@@ -49,17 +55,12 @@ class ModerationCog(commands.Cog):
                     )
                     await channel.send(embed=embed)
         except Exception as e:
-            logger.error(f"Failed to log action: {e}")
+            logger.error("Failed to log action: %s", e)
     
     @app_commands.command(name="kick", description="Kick a member from the server")
     @app_commands.describe(member="The member to kick", reason="Reason for the kick")
+    @require_permission("kick_members")
     async def kick(self, interaction: discord.Interaction, member: discord.Member, reason: str = None):
-        if not interaction.user.guild_permissions.kick_members:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need kick members permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             await member.kick(reason=reason)
             embed = self.create_embed(
@@ -68,7 +69,7 @@ class ModerationCog(commands.Cog):
                 0xe74c3c
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Member Kicked", interaction.user, member, reason)
+            self.schedule_log(interaction.guild, "Member Kicked", interaction.user, member, reason)
         except Exception as e:
             await interaction.response.send_message(
                 embed=self.create_embed("❌ Error", f"Failed to kick member: {str(e)}", 0xff0000),
@@ -77,13 +78,8 @@ class ModerationCog(commands.Cog):
     
     @app_commands.command(name="ban", description="Ban a member from the server")
     @app_commands.describe(member="The member to ban", reason="Reason for the ban", delete_days="Days of messages to delete (0-7)")
+    @require_permission("ban_members")
     async def ban(self, interaction: discord.Interaction, member: discord.Member, reason: str = None, delete_days: int = 1):
-        if not interaction.user.guild_permissions.ban_members:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need ban members permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             await member.ban(reason=reason, delete_message_seconds=max(0, min(7, delete_days)) * 86400)
             embed = self.create_embed(
@@ -92,7 +88,7 @@ class ModerationCog(commands.Cog):
                 0xe74c3c
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Member Banned", interaction.user, member, reason)
+            self.schedule_log(interaction.guild, "Member Banned", interaction.user, member, reason)
         except Exception as e:
             await interaction.response.send_message(
                 embed=self.create_embed("❌ Error", f"Failed to ban member: {str(e)}", 0xff0000),
@@ -101,15 +97,17 @@ class ModerationCog(commands.Cog):
     
     @app_commands.command(name="unban", description="Unban a user from the server")
     @app_commands.describe(user_id="The ID of the user to unban", reason="Reason for the unban")
+    @require_permission("ban_members")
     async def unban(self, interaction: discord.Interaction, user_id: str, reason: str = None):
-        if not interaction.user.guild_permissions.ban_members:
+        match = USER_ID_RE.search(user_id)
+        if not match:
             return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need ban members permission.", 0xff0000),
+                embed=self.create_embed("❌ Error", "Please provide a valid user ID or mention.", 0xff0000),
                 ephemeral=True
             )
         
         try:
-            user = await self.bot.fetch_user(int(user_id))
+            user = await self.bot.fetch_user(int(match.group()))
             await interaction.guild.unban(user, reason=reason)
             embed = self.create_embed(
                 "🔓 User Unbanned", 
@@ -117,7 +115,7 @@ class ModerationCog(commands.Cog):
                 0x2ecc71
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "User Unbanned", interaction.user, user, reason)
+            self.schedule_log(interaction.guild, "User Unbanned", interaction.user, user, reason)
         except Exception as e:
             await interaction.response.send_message(
                 embed=self.create_embed("❌ Error", f"Failed to unban user: {str(e)}", 0xff0000),
@@ -126,13 +124,8 @@ class ModerationCog(commands.Cog):
     
     @app_commands.command(name="mute", description="Mute a member")
     @app_commands.describe(member="The member to mute", duration="Duration in minutes", reason="Reason for the mute")
+    @require_permission("moderate_members")
     async def mute(self, interaction: discord.Interaction, member: discord.Member, duration: int = 60, reason: str = None):
-        if not interaction.user.guild_permissions.moderate_members:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need moderate members permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             until = discord.utils.utcnow() + timedelta(minutes=duration)
             await member.timeout(until, reason=reason)
@@ -143,7 +136,7 @@ class ModerationCog(commands.Cog):
                 0xf39c12
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Member Muted", interaction.user, member, reason)
+            self.schedule_log(interaction.guild, "Member Muted", interaction.user, member, reason)
         except Exception as e:
             await interaction.response.send_message(
                 embed=self.create_embed("❌ Error", f"Failed to mute member: {str(e)}", 0xff0000),
@@ -152,13 +145,8 @@ class ModerationCog(commands.Cog):
     
     @app_commands.command(name="unmute", description="Unmute a member")
     @app_commands.describe(member="The member to unmute", reason="Reason for the unmute")
+    @require_permission("moderate_members")
     async def unmute(self, interaction: discord.Interaction, member: discord.Member, reason: str = None):
-        if not interaction.user.guild_permissions.moderate_members:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need moderate members permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             await member.timeout(None, reason=reason)
             embed = self.create_embed(
@@ -167,7 +155,7 @@ class ModerationCog(commands.Cog):
                 0x2ecc71
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Member Unmuted", interaction.user, member, reason)
+            self.schedule_log(interaction.guild, "Member Unmuted", interaction.user, member, reason)
         except Exception as e:
             await interaction.response.send_message(
                 embed=self.create_embed("❌ Error", f"Failed to unmute member: {str(e)}", 0xff0000),
@@ -176,13 +164,8 @@ class ModerationCog(commands.Cog):
     
     @app_commands.command(name="warn", description="Warn a member")
     @app_commands.describe(member="The member to warn", reason="Reason for the warning")
+    @require_permission("moderate_members")
     async def warn(self, interaction: discord.Interaction, member: discord.Member, reason: str = "No reason provided"):
-        if not interaction.user.guild_permissions.moderate_members:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need moderate members permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             # Store warning in database
             if self.bot.db_pool:
@@ -204,7 +187,7 @@ class ModerationCog(commands.Cog):
                 0xf39c12
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Member Warned", interaction.user, member, reason)
+            self.schedule_log(interaction.guild, "Member Warned", interaction.user, member, reason)
             
             # DM the user
             try:
@@ -225,13 +208,8 @@ class ModerationCog(commands.Cog):
     
     @app_commands.command(name="purge", description="Delete multiple messages")
     @app_commands.describe(amount="Number of messages to delete (1-100)", user="Only delete messages from this user")
+    @require_permission("manage_messages")
     async def purge(self, interaction: discord.Interaction, amount: int, user: discord.User = None):
-        if not interaction.user.guild_permissions.manage_messages:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need manage messages permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         amount = max(1, min(100, amount))
         
         try:
@@ -247,7 +225,7 @@ class ModerationCog(commands.Cog):
                 0xe74c3c
             )
             await interaction.response.send_message(embed=embed, delete_after=5)
-            await self.log_action(interaction.guild, "Messages Purged", interaction.user, f"{len(deleted)} messages in {interaction.channel.mention}")
+            self.schedule_log(interaction.guild, "Messages Purged", interaction.user, f"{len(deleted)} messages in {interaction.channel.mention}")
         except Exception as e:
             await interaction.response.send_message(
                 embed=self.create_embed("❌ Error", f"Failed to purge messages: {str(e)}", 0xff0000),
@@ -256,13 +234,8 @@ class ModerationCog(commands.Cog):
     
     @app_commands.command(name="slowmode", description="Set channel slowmode")
     @app_commands.describe(seconds="Slowmode delay in seconds (0-21600)", channel="Channel to modify")
+    @require_permission("manage_channels")
     async def slowmode(self, interaction: discord.Interaction, seconds: int, channel: discord.TextChannel = None):
-        if not interaction.user.guild_permissions.manage_channels:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need manage channels permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         channel = channel or interaction.channel
         seconds = max(0, min(21600, seconds))
         
@@ -274,7 +247,7 @@ class ModerationCog(commands.Cog):
                 0x3498db
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Slowmode Changed", interaction.user, f"{channel.mention} to {seconds}s")
+            self.schedule_log(interaction.guild, "Slowmode Changed", interaction.user, f"{channel.mention} to {seconds}s")
         except Exception as e:
             await interaction.response.send_message(
                 embed=self.create_embed("❌ Error", f"Failed to set slowmode: {str(e)}", 0xff0000),
@@ -283,13 +256,8 @@ class ModerationCog(commands.Cog):
     
     @app_commands.command(name="lock", description="Lock a channel")
     @app_commands.describe(channel="Channel to lock", reason="Reason for locking")
+    @require_permission("manage_channels")
     async def lock(self, interaction: discord.Interaction, channel: discord.TextChannel = None, reason: str = None):
-        if not interaction.user.guild_permissions.manage_channels:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need manage channels permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         channel = channel or interaction.channel
         
         try:
@@ -303,7 +271,7 @@ class ModerationCog(commands.Cog):
                 0xe74c3c
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Channel Locked", interaction.user, channel.mention, reason)
+            self.schedule_log(interaction.guild, "Channel Locked", interaction.user, channel.mention, reason)
         except Exception as e:
             await interaction.response.send_message(
                 embed=self.create_embed("❌ Error", f"Failed to lock channel: {str(e)}", 0xff0000),
@@ -312,13 +280,8 @@ class ModerationCog(commands.Cog):
     
     @app_commands.command(name="unlock", description="Unlock a channel")
     @app_commands.describe(channel="Channel to unlock", reason="Reason for unlocking")
+    @require_permission("manage_channels")
     async def unlock(self, interaction: discord.Interaction, channel: discord.TextChannel = None, reason: str = None):
-        if not interaction.user.guild_permissions.manage_channels:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need manage channels permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         channel = channel or interaction.channel
         
         try:
@@ -332,7 +295,7 @@ class ModerationCog(commands.Cog):
                 0x2ecc71
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Channel Unlocked", interaction.user, channel.mention, reason)
+            self.schedule_log(interaction.guild, "Channel Unlocked", interaction.user, channel.mention, reason)
         except Exception as e:
             await interaction.response.send_message(
                 embed=self.create_embed("❌ Error", f"Failed to unlock channel: {str(e)}", 0xff0000),
@@ -341,13 +304,8 @@ class ModerationCog(commands.Cog):
     
     @app_commands.command(name="nickname", description="Change a member's nickname")
     @app_commands.describe(member="Member to change nickname", nickname="New nickname (leave empty to remove)")
+    @require_permission("manage_nicknames")
     async def nickname(self, interaction: discord.Interaction, member: discord.Member, nickname: str = None):
-        if not interaction.user.guild_permissions.manage_nicknames:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need manage nicknames permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             old_nick = member.display_name
             await member.edit(nick=nickname)
@@ -358,7 +316,7 @@ class ModerationCog(commands.Cog):
                 0x3498db
             )
             await interaction.response.send_message(embed=embed)
-            await self.log_action(interaction.guild, "Nickname Changed", interaction.user, f"{member.mention}: {old_nick} → {nickname or 'Removed'}")
+            self.schedule_log(interaction.guild, "Nickname Changed", interaction.user, f"{member.mention}: {old_nick} → {nickname or 'Removed'}")
         except Exception as e:
             await interaction.response.send_message(
                 embed=self.create_embed("❌ Error", f"Failed to change nickname: {str(e)}", 0xff0000),
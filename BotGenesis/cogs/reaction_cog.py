@@ -8,9 +8,25 @@ import asyncio
 class ReactionCog(commands.Cog):
     """A cog that automatically adds reactions to messages and manages star reactions based on votes."""
     
+    # Seconds to wait for more thumbs up reactions before counting them
+    STAR_CHECK_DELAY = 1.0
+    
     def __init__(self, bot):
         self.bot = bot
-        self.config = self.load_config()
+        self.config = None  # loaded in cog_load
+        self.target_channels = frozenset()  # O(1) membership for listeners
+        self.pending_star_checks = {}  # message id -> pending star check task
+    
+    async def cog_load(self):
+        """Read config.json off the event loop before the listeners are registered."""
+        self.config = await asyncio.to_thread(self.load_config)
+        self.target_channels = frozenset(self.config["target_channels"])
+    
+    def cog_unload(self):
+        """Cancel star checks that are still waiting."""
+        for task in self.pending_star_checks.values():
+            task.cancel()
+        self.pending_star_checks.clear()
         
     def load_config(self):
         """Load configuration from config.json or create default if it doesn't exist."""
@@ -50,8 +66,13 @@ class ReactionCog(commands.Cog):
     def save_config(self):
         """Save current configuration to config.json."""
         try:
-            with open("config.json", "w") as f:
+            # Write to a temp file and swap it in so a crash mid-write can't corrupt the config;
+            # fsync first so the rename never exposes a file whose data hasn't reached disk
+            with open("config.json.tmp", "w") as f:
                 json.dump(self.config, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace("config.json.tmp", "config.json")
         except Exception as e:
             print(f"Error saving config: {e}")
     
@@ -59,12 +80,12 @@ class ReactionCog(commands.Cog):
     async def on_message(self, message):
         """Automatically add thumbs up and thumbs down reactions to messages in target channels."""
         try:
-            # Skip if message is from a bot
-            if message.author.bot:
+            # Skip bot messages and system messages (joins, pins, boosts)
+            if message.author.bot or message.is_system():
                 return
             
             # Check if message is in one of the target channels
-            if message.channel.id not in self.config["target_channels"]:
+            if message.channel.id not in self.target_channels:
                 return
             
             # Add thumbs up and thumbs down reactions
@@ -81,46 +102,62 @@ class ReactionCog(commands.Cog):
     @commands.Cog.listener()
     async def on_reaction_add(self, reaction, user):
         """Monitor reactions and add star when thumbs up threshold is reached."""
+        # Skip if reaction is from a bot
+        if user.bot:
+            return
+        
+        # Check if reaction is in one of the target channels
+        if reaction.message.channel.id not in self.target_channels:
+            return
+        
+        # Only thumbs up reactions count towards the star threshold
+        if str(reaction.emoji) == self.config["emojis"]["thumbs_up"]:
+            self.schedule_star_check(reaction)
+    
+    def schedule_star_check(self, reaction):
+        """Coalesce a burst of thumbs up reactions on one message into a single star check."""
+        message_id = reaction.message.id
+        pending = self.pending_star_checks.get(message_id)
+        if pending and not pending.done():
+            pending.cancel()
+        self.pending_star_checks[message_id] = asyncio.create_task(self.delayed_star_check(reaction))
+    
+    async def delayed_star_check(self, reaction):
+        """Wait for reactions to settle, then count thumbs up once and add the star if needed."""
+        message_id = reaction.message.id
         try:
-            # Skip if reaction is from a bot
-            if user.bot:
-                return
+            await asyncio.sleep(self.STAR_CHECK_DELAY)
             
-            # Check if reaction is in one of the target channels
-            if reaction.message.channel.id not in self.config["target_channels"]:
-                return
-            
-            # Check if the reaction is a thumbs up
-            thumbs_up_emoji = self.config["emojis"]["thumbs_up"]
             star_emoji = self.config["emojis"]["star"]
             
-            # Handle custom emoji format
-            if str(reaction.emoji) == thumbs_up_emoji:
-                # Count only non-bot users for the threshold
-                user_count = 0
-                async for reaction_user in reaction.users():
-                    if not reaction_user.bot:
-                        user_count += 1
+            # Count only non-bot users for the threshold
+            user_count = 0
+            async for reaction_user in reaction.users():
+                if not reaction_user.bot:
+                    user_count += 1
+            
+            # Check if thumbs up count has reached the threshold
+            if user_count >= self.config["star_threshold"]:
+                # Check if star reaction is already present
+                has_star = False
+                for existing_reaction in reaction.message.reactions:
+                    if str(existing_reaction.emoji) == star_emoji:
+                        has_star = True
+                        break
                 
-                # Check if thumbs up count has reached the threshold
-                if user_count >= self.config["star_threshold"]:
-                    # Check if star reaction is already present
-                    has_star = False
-                    for existing_reaction in reaction.message.reactions:
-                        if str(existing_reaction.emoji) == star_emoji:
-                            has_star = True
-                            break
+                # Add star reaction if not already present
+                if not has_star:
+                    await reaction.message.add_reaction(star_emoji)
                     
-                    # Add star reaction if not already present
-                    if not has_star:
-                        await reaction.message.add_reaction(star_emoji)
-                        
         except discord.errors.Forbidden:
             print(f"Missing permissions to add star reaction in channel {reaction.message.channel.id}")
         except discord.errors.HTTPException as e:
             print(f"HTTP error adding star reaction: {e}")
         except Exception as e:
             print(f"Unexpected error in on_reaction_add: {e}")
+        finally:
+            if self.pending_star_checks.get(message_id) is asyncio.current_task():
+                del self.pending_star_checks[message_id]
     
     @commands.command(name="set_threshold")
     @commands.has_permissions(administrator=True)
@@ -130,8 +167,10 @@ class ReactionCog(commands.Cog):
             await ctx.send("Threshold must be at least 1.")
             return
         
-        self.config["star_threshold"] = threshold
-        self.save_config()
+        # Nothing to persist if the threshold is unchanged
+        if threshold != self.config["star_threshold"]:
+            self.config["star_threshold"] = threshold
+            await asyncio.to_thread(self.save_config)
         await ctx.send(f"Star reaction threshold set to {threshold}.")
     
     @commands.command(name="show_config")
@@ -148,7 +187,8 @@ class ReactionCog(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def reload_config(self, ctx):
         """Reload configuration from file (admin only)."""
-        self.config = self.load_config()
+        self.config = await asyncio.to_thread(self.load_config)
+        self.target_channels = frozenset(self.config["target_channels"])
         await ctx.send("Configuration reloaded successfully.")
 
 
@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands, tasks
 import asyncio
 import logging
-from datetime import datetime, timedelta
+import time
 from typing import Optional
 
 
@@ -26,15 +26,21 @@ class ReconnectionCog(commands.Cog):
         self.base_delay = 5  # Base delay in seconds
         self.max_delay = 300  # Maximum delay in seconds (5 minutes)
         self.retry_count = 0
-        self.last_disconnect_time: Optional[datetime] = None
+        self.last_disconnect_time: Optional[float] = None  # time.monotonic() of last disconnect
         self.is_reconnecting = False
+        # Set while the gateway session is up; lets waiters wake on ready/resume instead of polling
+        self.connection_restored = asyncio.Event()
+        # Strong references to reconnection/health-check tasks so they can't be garbage collected
+        self.background_tasks: set[asyncio.Task] = set()
         
         # Setup logging
         self._setup_logging()
         
     def _setup_logging(self):
         """Setup logging for the reconnection cog."""
-        if not self.logger.handlers:
+        # Records propagate to the root logger; only add a console handler of our own when
+        # nothing is configured there, otherwise every line is written to the console twice
+        if not self.logger.handlers and not logging.getLogger().handlers:
             handler = logging.StreamHandler()
             formatter = logging.Formatter(
                 '[%(asctime)s] [RECONNECTION] %(levelname)s: %(message)s',
@@ -48,6 +54,15 @@ class ReconnectionCog(commands.Cog):
         """Clean up when the cog is unloaded."""
         if self.connection_monitor.is_running():
             self.connection_monitor.cancel()
+        for task in self.background_tasks:
+            task.cancel()
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine in the background, tracked so cog_unload can cancel it."""
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
         
     @tasks.loop(seconds=30)
     async def connection_monitor(self):
@@ -63,16 +78,16 @@ class ReconnectionCog(commands.Cog):
             
             # If we reach here and had previous disconnection issues, log recovery
             if self.retry_count > 0:
-                self.logger.info(f"Connection successfully restored after {self.retry_count} retry attempts")
+                self.logger.info("Connection successfully restored after %s retry attempts", self.retry_count)
                 self.retry_count = 0
                 self.last_disconnect_time = None
                 self.is_reconnecting = False
                 
         except (discord.HTTPException, discord.ConnectionClosed, asyncio.TimeoutError, 
                 discord.NotFound, discord.Forbidden, ConnectionError, OSError) as e:
-            self.logger.warning(f"Connection issue detected: {type(e).__name__}: {e}")
+            self.logger.warning("Connection issue detected: %s: %s", type(e).__name__, e)
             if not self.is_reconnecting:
-                asyncio.create_task(self.handle_connection_error(e))
+                self._spawn(self.handle_connection_error(e))
             
     @connection_monitor.before_loop
     async def before_connection_monitor(self):
@@ -84,9 +99,10 @@ class ReconnectionCog(commands.Cog):
     async def on_ready(self):
         """Handle bot ready event."""
         if self.bot.user:
-            self.logger.info(f"Bot connected as {self.bot.user} (ID: {self.bot.user.id})")
+            self.logger.info("Bot connected as %s (ID: %s)", self.bot.user, self.bot.user.id)
         else:
             self.logger.info("Bot connected (user info not available yet)")
+        self.connection_restored.set()
         
         # Start connection monitoring if not already running
         if not self.connection_monitor.is_running():
@@ -94,7 +110,7 @@ class ReconnectionCog(commands.Cog):
         
         # Reset retry count on successful connection
         if self.retry_count > 0:
-            self.logger.info(f"Successfully reconnected after {self.retry_count} attempts")
+            self.logger.info("Successfully reconnected after %s attempts", self.retry_count)
             self.retry_count = 0
             self.last_disconnect_time = None
             self.is_reconnecting = False
@@ -102,21 +118,23 @@ class ReconnectionCog(commands.Cog):
     @commands.Cog.listener()
     async def on_disconnect(self):
         """Handle bot disconnect event."""
-        self.last_disconnect_time = datetime.utcnow()
+        self.last_disconnect_time = time.monotonic()
+        self.connection_restored.clear()
         self.logger.warning("Bot disconnected from Discord")
         
         # Start reconnection logic if not already reconnecting
         if not self.is_reconnecting:
-            asyncio.create_task(self.handle_connection_error(Exception("Bot disconnected")))
+            self._spawn(self.handle_connection_error(Exception("Bot disconnected")))
         
     @commands.Cog.listener()
     async def on_resumed(self):
         """Handle bot resume event."""
         self.logger.info("Bot session resumed")
+        self.connection_restored.set()
         
         # Reset retry count on successful resume
         if self.retry_count > 0:
-            self.logger.info(f"Session resumed after {self.retry_count} reconnection attempts")
+            self.logger.info("Session resumed after %s reconnection attempts", self.retry_count)
             self.retry_count = 0
             self.last_disconnect_time = None
             self.is_reconnecting = False
@@ -125,7 +143,7 @@ class ReconnectionCog(commands.Cog):
     async def on_connect(self):
         """Handle bot connect event."""
         if self.retry_count > 0:
-            self.logger.info(f"Reconnection attempt {self.retry_count} successful")
+            self.logger.info("Reconnection attempt %s successful", self.retry_count)
         else:
             self.logger.info("Initial connection established")
             
@@ -140,7 +158,7 @@ class ReconnectionCog(commands.Cog):
             return  # Already handling reconnection
             
         self.is_reconnecting = True
-        self.logger.error(f"Connection error detected: {type(error).__name__}: {error}")
+        self.logger.error("Connection error detected: %s: %s", type(error).__name__, error)
         
         try:
             # Reset retry count at start of new reconnection attempt
@@ -152,37 +170,41 @@ class ReconnectionCog(commands.Cog):
                 
                 # Calculate delay with exponential backoff
                 delay = min(self.base_delay * (2 ** (self.retry_count - 1)), self.max_delay)
-                self.logger.info(f"Waiting {delay} seconds before reconnection attempt {self.retry_count}/{self.max_retries}")
+                self.logger.info("Waiting %s seconds before reconnection attempt %s/%s", delay, self.retry_count, self.max_retries)
                 
-                await asyncio.sleep(delay)
+                # Back off, but wake early if the gateway reports ready/resumed meanwhile
+                try:
+                    await asyncio.wait_for(self.connection_restored.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
                 
                 # Check if bot has recovered during our wait
-                if self.bot.is_ready():
-                    self.logger.info(f"Bot recovered during backoff wait (attempt {self.retry_count})")
+                if self.bot.is_ready() or self.connection_restored.is_set():
+                    self.logger.info("Bot recovered during backoff wait (attempt %s)", self.retry_count)
                     break
                 
                 try:
-                    self.logger.info(f"Testing connection (attempt {self.retry_count}/{self.max_retries})")
+                    self.logger.info("Testing connection (attempt %s/%s)", self.retry_count, self.max_retries)
                     # Test connection with a simple API call
                     if self.bot.user:
                         await asyncio.wait_for(self.bot.fetch_user(self.bot.user.id), timeout=10.0)
-                        self.logger.info(f"Connection test successful on attempt {self.retry_count}")
+                        self.logger.info("Connection test successful on attempt %s", self.retry_count)
                         break
                     else:
                         self.logger.warning("Bot user not available for connection test")
                         
                 except Exception as test_error:
-                    self.logger.error(f"Connection test failed on attempt {self.retry_count}: {type(test_error).__name__}: {test_error}")
+                    self.logger.error("Connection test failed on attempt %s: %s: %s", self.retry_count, type(test_error).__name__, test_error)
                     # Continue loop for next retry
                     continue
             
             # Check final status
             if self.retry_count >= self.max_retries and not self.bot.is_ready():
-                self.logger.critical(f"Max retry attempts ({self.max_retries}) exceeded. Manual intervention required.")
+                self.logger.critical("Max retry attempts (%s) exceeded. Manual intervention required.", self.max_retries)
                 # Start a slower periodic check instead of giving up completely
-                asyncio.create_task(self._periodic_health_check())
+                self._spawn(self._periodic_health_check())
             elif self.bot.is_ready():
-                self.logger.info(f"Connection successfully restored after {self.retry_count} attempts")
+                self.logger.info("Connection successfully restored after %s attempts", self.retry_count)
                 
         finally:
             # Always reset reconnection state
@@ -199,7 +221,13 @@ class ReconnectionCog(commands.Cog):
         self.logger.info("Starting periodic health check after max retries exceeded")
         
         while not self.bot.is_ready():
-            await asyncio.sleep(60)  # Check every minute
+            # Wake immediately on ready/resume; otherwise probe the API once a minute
+            try:
+                await asyncio.wait_for(self.connection_restored.wait(), timeout=60)
+                self.logger.info("Periodic health check: Gateway session restored!")
+                break
+            except asyncio.TimeoutError:
+                pass
             
             try:
                 if self.bot.user:
@@ -209,7 +237,7 @@ class ReconnectionCog(commands.Cog):
                     self.last_disconnect_time = None
                     break
             except Exception as e:
-                self.logger.debug(f"Periodic health check failed: {type(e).__name__}: {e}")
+                self.logger.debug("Periodic health check failed: %s: %s", type(e).__name__, e)
                 continue
                 
         self.logger.info("Periodic health check completed - connection restored")
@@ -222,37 +250,28 @@ class ReconnectionCog(commands.Cog):
         
         Usage: !connection_status (requires administrator permissions)
         """
-        embed = discord.Embed(
-            title="🔗 Connection Status",
-            color=discord.Color.green() if self.bot.is_ready() else discord.Color.red(),
-            timestamp=datetime.utcnow()
-        )
-        
-        # Connection status
-        status = "🟢 Connected" if self.bot.is_ready() else "🔴 Disconnected"
-        embed.add_field(name="Status", value=status, inline=True)
-        
-        # Latency
-        latency = round(self.bot.latency * 1000, 2)
-        embed.add_field(name="Latency", value=f"{latency}ms", inline=True)
-        
-        # Retry statistics
-        embed.add_field(name="Current Retry Count", value=str(self.retry_count), inline=True)
+        is_ready = self.bot.is_ready()
         
         # Last disconnect time
         if self.last_disconnect_time:
-            time_since = datetime.utcnow() - self.last_disconnect_time
-            embed.add_field(
-                name="Last Disconnect", 
-                value=f"{time_since.total_seconds():.1f} seconds ago", 
-                inline=True
-            )
+            last_disconnect = f"{time.monotonic() - self.last_disconnect_time:.1f} seconds ago"
         else:
-            embed.add_field(name="Last Disconnect", value="None recorded", inline=True)
-            
-        # Configuration
-        embed.add_field(name="Max Retries", value=str(self.max_retries), inline=True)
-        embed.add_field(name="Base Delay", value=f"{self.base_delay}s", inline=True)
+            last_disconnect = "None recorded"
+        
+        # Build the whole embed in one pass instead of six add_field calls
+        embed = discord.Embed.from_dict({
+            "title": "🔗 Connection Status",
+            "color": 0x2ecc71 if is_ready else 0xe74c3c,
+            "timestamp": discord.utils.utcnow().isoformat(),
+            "fields": [
+                {"name": "Status", "value": "🟢 Connected" if is_ready else "🔴 Disconnected", "inline": True},
+                {"name": "Latency", "value": f"{round(self.bot.latency * 1000, 2)}ms", "inline": True},
+                {"name": "Current Retry Count", "value": str(self.retry_count), "inline": True},
+                {"name": "Last Disconnect", "value": last_disconnect, "inline": True},
+                {"name": "Max Retries", "value": str(self.max_retries), "inline": True},
+                {"name": "Base Delay", "value": f"{self.base_delay}s", "inline": True},
+            ],
+        })
         
         await ctx.send(embed=embed)
         
@@ -299,17 +318,17 @@ class ReconnectionCog(commands.Cog):
             embed = discord.Embed(
                 title="✅ Reconnection Configuration Updated",
                 description="\n".join(updated),
-                color=discord.Color.green(),
-                timestamp=datetime.utcnow()
+                color=0x2ecc71,
+                timestamp=discord.utils.utcnow()
             )
             await ctx.send(embed=embed)
-            self.logger.info(f"Reconnection config updated by {ctx.author}: {', '.join(updated)}")
+            self.logger.info("Reconnection config updated by %s: %s", ctx.author, ', '.join(updated))
         else:
             # Show current configuration
             embed = discord.Embed(
                 title="🔧 Current Reconnection Configuration",
-                color=discord.Color.blue(),
-                timestamp=datetime.utcnow()
+                color=0x3498db,
+                timestamp=discord.utils.utcnow()
             )
             embed.add_field(name="Max Retries", value=str(self.max_retries), inline=True)
             embed.add_field(name="Base Delay", value=f"{self.base_delay}s", inline=True)
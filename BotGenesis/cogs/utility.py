@@ -6,23 +6,35 @@ Contains utility commands including remaining moderation commands and server inf
 import discord
 from discord.ext import commands
 from discord import app_commands
-import asyncio
-from datetime import datetime, timedelta
-import json
+from cogs.checks import require_permission
 import logging
-import psutil
 import platform
 
 logger = logging.getLogger(__name__)
 
+# Fixed for the lifetime of the process
+PYTHON_VERSION = platform.python_version()
+DISCORD_PY_VERSION = discord.__version__
+
+# Permissions highlighted by /userinfo, as (label, bit) pairs tested against the raw permission value
+KEY_PERMISSIONS = (
+    ("Administrator", discord.Permissions.administrator.flag),
+    ("Manage Server", discord.Permissions.manage_guild.flag),
+    ("Manage Channels", discord.Permissions.manage_channels.flag),
+    ("Manage Roles", discord.Permissions.manage_roles.flag),
+    ("Ban Members", discord.Permissions.ban_members.flag),
+    ("Kick Members", discord.Permissions.kick_members.flag),
+)
+
 class UtilityCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.help_embed = self.build_help_embed()  # static content, built once
         
     def create_embed(self, title, description, color=0x3498db, footer=None):
         """Create a styled embed"""
         embed = discord.Embed(title=title, description=description, color=color)
-        embed.timestamp = datetime.utcnow()
+        embed.timestamp = discord.utils.utcnow()
         if footer:
             embed.set_footer(text=footer)
         else:
@@ -35,8 +47,10 @@ class UtilityCog(commands.Cog):
         user = user or interaction.user
         
         # Calculate account age
-        account_age = datetime.utcnow() - user.created_at
-        join_age = datetime.utcnow() - user.joined_at if user.joined_at else None
+        # Discord timestamps are timezone-aware, so compare against an aware "now"
+        now = discord.utils.utcnow()
+        account_age = now - user.created_at
+        join_age = now - user.joined_at if user.joined_at else None
         
         embed = self.create_embed(
             f"👤 User Information - {user.display_name}",
@@ -44,7 +58,7 @@ class UtilityCog(commands.Cog):
             0x3498db
         )
         
-        embed.set_thumbnail(url=user.avatar.url if user.avatar else user.default_avatar.url)
+        embed.set_thumbnail(url=user.display_avatar.url)
         
         embed.add_field(
             name="📋 Basic Info",
@@ -64,9 +78,9 @@ class UtilityCog(commands.Cog):
             inline=True
         )
         
-        # Get roles (excluding @everyone)
-        roles = [role.mention for role in reversed(user.roles[1:])]
-        roles_text = ", ".join(roles[:10])  # Limit to first 10 roles
+        # Get roles (excluding @everyone), only mentioning the 10 we display
+        roles = [role.mention for role in user.roles[:-11:-1] if not role.is_default()]
+        roles_text = ", ".join(roles)  # Limit to first 10 roles
         if len(user.roles) > 11:
             roles_text += f" (+{len(user.roles) - 11} more)"
         
@@ -77,20 +91,8 @@ class UtilityCog(commands.Cog):
         )
         
         # Get permissions
-        perms = user.guild_permissions
-        important_perms = []
-        if perms.administrator:
-            important_perms.append("Administrator")
-        if perms.manage_guild:
-            important_perms.append("Manage Server")
-        if perms.manage_channels:
-            important_perms.append("Manage Channels")
-        if perms.manage_roles:
-            important_perms.append("Manage Roles")
-        if perms.ban_members:
-            important_perms.append("Ban Members")
-        if perms.kick_members:
-            important_perms.append("Kick Members")
+        perms_value = user.guild_permissions.value
+        important_perms = [name for name, flag in KEY_PERMISSIONS if perms_value & flag]
         
         embed.add_field(
             name="🔑 Key Permissions",
@@ -133,7 +135,7 @@ class UtilityCog(commands.Cog):
         guild = interaction.guild
         
         # Calculate server age
-        server_age = datetime.utcnow() - guild.created_at
+        server_age = discord.utils.utcnow() - guild.created_at
         
         embed = self.create_embed(
             f"🏰 Server Information - {guild.name}",
@@ -157,12 +159,17 @@ class UtilityCog(commands.Cog):
         
         # Member counts
         total_members = guild.member_count
-        humans = len([m for m in guild.members if not m.bot])
+
+        # Count humans and online members in a single pass over the member list
+        humans = 0
+        online = 0
+        for m in guild.members:
+            if not m.bot:
+                humans += 1
+            if m.status != discord.Status.offline:
+                online += 1
         bots = total_members - humans
         
-        # Online members count
-        online = len([m for m in guild.members if m.status != discord.Status.offline])
-        
         embed.add_field(
             name="👥 Members",
             value=f"**Total:** {total_members}\n"
@@ -231,7 +238,7 @@ class UtilityCog(commands.Cog):
         if features:
             embed.add_field(
                 name="✨ Features",
-                value="\n".join(f"• {feature}" for feature in features[:8]),
+                value="\n".join([f"• {feature}" for feature in features[:8]]),
                 inline=False
             )
         
@@ -239,13 +246,8 @@ class UtilityCog(commands.Cog):
     
     @app_commands.command(name="warnings", description="View warnings for a user")
     @app_commands.describe(user="User to check warnings for")
+    @require_permission("moderate_members")
     async def warnings(self, interaction: discord.Interaction, user: discord.Member = None):
-        if not interaction.user.guild_permissions.moderate_members:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need moderate members permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         user = user or interaction.user
         
         try:
@@ -298,13 +300,8 @@ class UtilityCog(commands.Cog):
     
     @app_commands.command(name="invites", description="Manage server invites")
     @app_commands.describe(action="List, create, or delete invites", channel="Channel for new invite", max_uses="Max uses for new invite")
+    @require_permission("manage_guild", "manage server")
     async def invites(self, interaction: discord.Interaction, action: str, channel: discord.TextChannel = None, max_uses: int = 0):
-        if not interaction.user.guild_permissions.manage_guild:
-            return await interaction.response.send_message(
-                embed=self.create_embed("❌ Permission Denied", "You need manage server permission.", 0xff0000),
-                ephemeral=True
-            )
-        
         try:
             if action.lower() == "list":
                 invites = await interaction.guild.invites()
@@ -352,10 +349,12 @@ class UtilityCog(commands.Cog):
     async def botinfo(self, interaction: discord.Interaction):
         try:
             # Calculate uptime
-            uptime = datetime.utcnow() - self.bot.start_time
-            uptime_str = f"{uptime.days}d {uptime.seconds//3600}h {(uptime.seconds//60)%60}m"
+            uptime = discord.utils.utcnow() - self.bot.start_time
+            hours, remainder = divmod(uptime.seconds, 3600)
+            uptime_str = f"{uptime.days}d {hours}h {remainder // 60}m"
             
-            # Get system info
+            # Get system info (psutil is only needed here, so import it on first use)
+            import psutil
             memory_usage = psutil.virtual_memory()
             cpu_usage = psutil.cpu_percent()
             
@@ -365,7 +364,7 @@ class UtilityCog(commands.Cog):
                 0x3498db
             )
             
-            embed.set_thumbnail(url=self.bot.user.avatar.url if self.bot.user.avatar else self.bot.user.default_avatar.url)
+            embed.set_thumbnail(url=self.bot.user.display_avatar.url)
             
             embed.add_field(
                 name="📊 Statistics",
@@ -378,8 +377,8 @@ class UtilityCog(commands.Cog):
             
             embed.add_field(
                 name="💻 System",
-                value=f"**Python:** {platform.python_version()}\n"
-                      f"**Discord.py:** {discord.__version__}\n"
+                value=f"**Python:** {PYTHON_VERSION}\n"
+                      f"**Discord.py:** {DISCORD_PY_VERSION}\n"
                       f"**CPU Usage:** {cpu_usage}%\n"
                       f"**Memory:** {memory_usage.percent}%",
                 inline=True
@@ -412,8 +411,9 @@ class UtilityCog(commands.Cog):
                 ephemeral=True
             )
     
-    @app_commands.command(name="help", description="Get help with bot commands")
-    async def help(self, interaction: discord.Interaction):
+    @staticmethod
+    def build_help_embed():
+        """Build the static /help embed"""
         embed = discord.Embed(
             title="🛡️ Advanced Moderation Bot - Command Help",
             description="A comprehensive Discord bot with advanced moderation and administration features.",
@@ -491,8 +491,11 @@ class UtilityCog(commands.Cog):
         )
         
         embed.set_footer(text="Advanced Moderation Bot | Use slash commands for all features")
-        
-        await interaction.response.send_message(embed=embed)
+        return embed
+    
+    @app_commands.command(name="help", description="Get help with bot commands")
+    async def help(self, interaction: discord.Interaction):
+        await interaction.response.send_message(embed=self.help_embed)
 
 async def setup(bot):
     await bot.add_cog(UtilityCog(bot))
\ No newline at end of file
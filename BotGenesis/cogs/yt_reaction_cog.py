@@ -9,38 +9,40 @@ class YTReactionCog(commands.Cog):
         self.bot = bot
         self.target_channel_id = 1421567126149271662
         self.yt_emoji_id = 1421567032419287091
+        # Raw emoji string used when the emoji isn't cached; built once instead of per message
+        self.yt_emoji_fallback = f"<:YT:{self.yt_emoji_id}>"
         
     @commands.Cog.listener()
     async def on_message(self, message):
         """Automatically add YT emoji reaction to every message in the target channel."""
         try:
-            # Debug logging - check your onrender.com logs for these
-            print(f"Message received - Channel ID: {message.channel.id}, Author: {message.author}, Bot: {message.author.bot}")
-            
-            # Skip if message is from a bot to avoid potential loops
-            if message.author.bot:
+            # Skip bot messages to avoid potential loops, and system messages (joins, pins, boosts)
+            if message.author.bot or message.is_system():
                 return
             
             # Check if message is in the target channel or thread
             is_target_channel = message.channel.id == self.target_channel_id
-            is_target_thread = (hasattr(message.channel, 'parent_id') and 
+            is_target_thread = (hasattr(message.channel, 'parent_id') and
                               message.channel.parent_id == self.target_channel_id)
             
             if not (is_target_channel or is_target_thread):
                 return
             
+            # Debug logging - check your onrender.com logs for these
+            # (only for target channel messages, not every message the bot sees)
+            print(f"Message received - Channel ID: {message.channel.id}, Author: {message.author}")
             print(f"Target channel matched! Attempting to add YT reaction...")
             
-            # Try to get the emoji from the guild first (more reliable)
-            yt_emoji = discord.utils.get(message.guild.emojis, id=self.yt_emoji_id)
+            # Try to get the emoji from the client's emoji cache first (more reliable, O(1) by ID)
+            yt_emoji = self.bot.get_emoji(self.yt_emoji_id)
             
             if yt_emoji:
-                print(f"Found YT emoji in guild: {yt_emoji}")
+                print(f"Found YT emoji in cache: {yt_emoji}")
                 await message.add_reaction(yt_emoji)
             else:
                 # Fallback to string format
-                print(f"YT emoji not found in guild, trying string format...")
-                await message.add_reaction(f"<:YT:{self.yt_emoji_id}>")
+                print(f"YT emoji not found in cache, trying string format...")
+                await message.add_reaction(self.yt_emoji_fallback)
             
             print("YT reaction added successfully!")
             
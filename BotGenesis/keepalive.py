@@ -7,7 +7,6 @@ from aiohttp import web
 import asyncio
 import logging
 from datetime import datetime
-import json
 
 logger = logging.getLogger(__name__)
 
@@ -116,7 +115,7 @@ def keep_alive():
             await runner.setup()
             site = web.TCPSite(runner, server.host, server.port)
             await site.start()
-            logger.info(f"Keepalive server started on {server.host}:{server.port}")
+            logger.info("Keepalive server started on %s:%s", server.host, server.port)
         
         # Run server in background
         loop = asyncio.new_event_loop()
@@ -131,7 +130,7 @@ def keep_alive():
         logger.info("Keepalive system initialized")
         
     except Exception as e:
-        logger.error(f"Failed to start keepalive server: {e}")
+        logger.error("Failed to start keepalive server: %s", e)
 
 if __name__ == "__main__":
     # For testing the server standalone
@@ -10,8 +10,8 @@ import os
 import asyncio
 import asyncpg
 import aiohttp
+import hashlib
 import logging
-from datetime import datetime
 import json
 from dotenv import load_dotenv
 
@@ -40,8 +40,42 @@ class AdvancedModerationBot(commands.Bot):
         )
         
         self.db_pool = None
-        self.start_time = datetime.utcnow()
+        self.start_time = discord.utils.utcnow()
         self.session = None
+        self.log_channel_ids = {}  # guild id -> log channel id (or None), filled on first lookup
+        
+    async def sync_commands_if_changed(self, hash_file='command_tree.hash'):
+        """Sync slash commands only when the command tree differs from the last synced one"""
+        payload = {
+            'application_id': self.application_id,
+            'commands': [command.to_dict(self.tree) for command in self.tree.get_commands()]
+        }
+        digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+        
+        # FORCE_COMMAND_SYNC=1 resyncs anyway, e.g. after commands were changed or deleted outside this bot
+        force = os.getenv('FORCE_COMMAND_SYNC', '').lower() in ('1', 'true', 'yes')
+        if not force and await asyncio.to_thread(self.read_command_hash, hash_file) == digest:
+            logger.info("Slash commands unchanged, skipping sync (set FORCE_COMMAND_SYNC=1 to force)")
+            return
+        
+        await self.tree.sync()
+        await asyncio.to_thread(self.write_command_hash, hash_file, digest)
+        logger.info("Slash commands synced")
+    
+    @staticmethod
+    def read_command_hash(hash_file):
+        """Return the digest stored by the last sync, or None if there isn't one"""
+        try:
+            with open(hash_file, 'r') as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+    
+    @staticmethod
+    def write_command_hash(hash_file, digest):
+        """Store the digest of the command tree that was just synced"""
+        with open(hash_file, 'w') as f:
+            f.write(digest)
         
     async def setup_database(self):
         """Initialize database connection pool"""
@@ -94,7 +128,17 @@ class AdvancedModerationBot(commands.Bot):
                 ''')
                 
         except Exception as e:
-            logger.error(f"Database setup failed: {e}")
+            logger.error("Database setup failed: %s", e)
+    
+    async def get_log_channel_id(self, guild_id):
+        """Return the guild's configured log channel ID, querying the database once per guild"""
+        if guild_id not in self.log_channel_ids:
+            async with self.db_pool.acquire() as conn:
+                self.log_channel_ids[guild_id] = await conn.fetchval(
+                    "SELECT log_channel_id FROM guild_settings WHERE guild_id = $1",
+                    guild_id
+                )
+        return self.log_channel_ids[guild_id]
     
     async def setup_hook(self):
         """Setup hook called when bot starts"""
@@ -117,19 +161,18 @@ class AdvancedModerationBot(commands.Bot):
             for cog in cogs_to_load:
                 try:
                     await self.load_extension(cog)
-                    logger.info(f"Loaded cog: {cog}")
+                    logger.info("Loaded cog: %s", cog)
                 except Exception as e:
-                    logger.error(f"Failed to load cog {cog}: {e}")
+                    logger.error("Failed to load cog %s: %s", cog, e)
             
             # Setup database
             await self.setup_database()
             
-            # Sync slash commands
-            await self.tree.sync()
-            logger.info("Slash commands synced")
+            # Sync slash commands (global syncs are rate limited, so skip unchanged trees)
+            await self.sync_commands_if_changed()
             
         except Exception as e:
-            logger.error(f"Setup hook failed: {e}")
+            logger.error("Setup hook failed: %s", e)
     
     async def close(self):
         """Cleanup when bot shuts down"""
@@ -141,8 +184,8 @@ class AdvancedModerationBot(commands.Bot):
     
     async def on_ready(self):
         """Called when bot is ready"""
-        logger.info(f"{self.user} has connected to Discord!")
-        logger.info(f"Bot is in {len(self.guilds)} guilds")
+        logger.info("%s has connected to Discord!", self.user)
+        logger.info("Bot is in %s guilds", len(self.guilds))
         
         # Set status
         activity = discord.Activity(
@@ -170,7 +213,7 @@ class AdvancedModerationBot(commands.Bot):
             )
             await ctx.send(embed=embed)
         else:
-            logger.error(f"Unhandled error: {error}")
+            logger.error("Unhandled error: %s", error)
             embed = discord.Embed(
                 title="❌ Error",
                 description="An unexpected error occurred.",
@@ -181,8 +224,21 @@ class AdvancedModerationBot(commands.Bot):
 # Create bot instance
 bot = AdvancedModerationBot()
 
+async def run_bot(token):
+    """Start the bot and close it cleanly when the loop stops"""
+    async with bot:
+        await bot.start(token)
+
 if __name__ == "__main__":
     try:
+        # Use uvloop's libuv-based event loop when installed (it is not available on Windows)
+        try:
+            import uvloop
+            loop_factory = uvloop.new_event_loop
+            logger.info("Using uvloop event loop")
+        except ImportError:
+            loop_factory = None
+        
         # Import keepalive to start web server
         from keepalive import keep_alive
         keep_alive()
@@ -192,6 +248,11 @@ if __name__ == "__main__":
         if not token:
             logger.error("DISCORD_TOKEN environment variable not set")
             exit(1)
-        bot.run(token)
+        # Pass the loop factory to the runner instead of setting a global event loop policy
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            try:
+                runner.run(run_bot(token))
+            except KeyboardInterrupt:
+                pass
     except Exception as e:
-        logger.error(f"Failed to start bot: {e}")
+        logger.error("Failed to start bot: %s", e)